@@ -1,8 +1,8 @@
 # app.py
 
 import streamlit as st
-import pandas as pd
 from logic.logic_core import arricchisci_dati_base
+from logic.validazione_dati import leggi_e_valida_excel, ErroreSchema
 from utils import local_css
 # --- IMPOSTAZIONI PAGINA E STILE ---
 # Questa configurazione verrà applicata a tutte le pagine
@@ -47,9 +47,19 @@ st.session_state['costi_fissi'] = costi_fissi_input
 st.divider()
 if uploaded_file is not None:
     try:
-        df_raw = pd.read_excel(uploaded_file)
-        # Salviamo il DataFrame arricchito con i dati ANNUALI nello stato della sessione
-        st.session_state['df'] = arricchisci_dati_base(df_raw)
-        st.success("File caricato e processato con successo! Seleziona una pagina dal menu a sinistra per iniziare l'analisi.")
+        # Lettura a blocchi con validazione e conversione dei tipi secondo lo schema atteso
+        df_raw, report_errori = leggi_e_valida_excel(uploaded_file)
+        if not report_errori.empty:
+            st.session_state['df'] = None
+            st.error(f"Il file contiene {len(report_errori)} righe non valide. Correggi le righe indicate e ricarica il file.")
+            st.dataframe(report_errori, use_container_width=True, hide_index=True)
+        else:
+            # Salviamo il DataFrame arricchito con i dati ANNUALI nello stato della sessione
+            st.session_state['df'] = arricchisci_dati_base(df_raw)
+            st.success("File caricato e processato con successo! Seleziona una pagina dal menu a sinistra per iniziare l'analisi.")
+    except ErroreSchema as e:
+        st.session_state['df'] = None
+        st.error(f"Errore nella struttura del file: {e}")
     except Exception as e:
+        st.session_state['df'] = None
         st.error(f"Errore nel processare il file: Assicurati che le colonne siano corrette. Dettaglio: {e}")
\ No newline at end of file
@@ -1,6 +1,13 @@
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional
 
+TRIMESTRI = ['Q1', 'Q2', 'Q3', 'Q4']
+SOGLIA_Z_ROBUSTO = -3.5
+SOGLIA_CALO_MINIMO = 0.5
+SOGLIA_VOLUME_MINIMO = 10
+MAX_PRODOTTI_ELENCATI = 5
+
 def analizza_kpi_trends(
     kpi_attuali: Dict[str, float],
     kpi_precedenti: Optional[Dict[str, float]]
@@ -208,4 +215,180 @@ def _goldmine_category_analysis(df: pd.DataFrame) -> List[str]:
                 "* **Implicazione:** Ogni vendita in questa categoria ha un impatto molto alto sulla profittabilità. Esiste un'enorme opportunità se si riesce ad aumentarne i volumi.\n"
                 "* **Raccomandazione:** Implementare strategie di up-selling e cross-selling per guidare i clienti verso questa categoria. Formare il personale per proporla attivamente."
             )
-    return insights
\ No newline at end of file
+    return insights
+
+
+def analizza_anomalie_prodotti(df_annuale: pd.DataFrame, periodo: Optional[str] = None) -> List[str]:
+    """
+    Analizza le serie trimestrali di vendite e margine di ogni prodotto e genera insight sulle anomalie.
+
+    Il calcolo è interamente vettoriale sulla matrice (prodotti × trimestri): per ogni trimestre si calcola
+    la variazione stagionale (log) rispetto al trimestre precedente e la si confronta con quella del resto
+    del catalogo tramite uno z-score robusto (mediana/MAD), con costo lineare nel numero di prodotti.
+    Il margine unitario è unico per l'intero anno, quindi sul margine si segnalano i prodotti venduti
+    sotto costo nel periodo, non variazioni di segno tra un trimestre e l'altro.
+
+    Parameters:
+        df_annuale (pd.DataFrame): DataFrame arricchito contenente i dati annuali. Deve includere le colonne:
+            'Nome Piatto', 'Prezzo Vendita', 'Costo Primo', 'Vendite_Q1' ... 'Vendite_Q4'.
+        periodo (str | None): Trimestre selezionato ('Q1', ..., 'Q4'). Se None o 'Anno Intero' considera tutti i trimestri.
+
+    Returns:
+        list[str]: Lista di insight OIR, uno per tipo di anomalia rilevata. Lista vuota se nessun trigger è attivato.
+    """
+    if df_annuale.empty:
+        return []
+
+    insights_list: List[str] = []
+    trimestri = TRIMESTRI if periodo in (None, 'Anno Intero') else [periodo]
+
+    vendite = df_annuale[[f'Vendite_{q}' for q in TRIMESTRI]].to_numpy(dtype=float)
+    margine_unitario = (df_annuale['Prezzo Vendita'] - df_annuale['Costo Primo']).to_numpy(dtype=float)
+    margini = vendite * margine_unitario[:, None]
+    nomi = df_annuale['Nome Piatto'].to_numpy()
+
+    # --- Crollo Vendite (z-score robusto sulle variazioni stagionali) ---
+    crollo_insight = _crollo_vendite_analysis(vendite, nomi, trimestri)
+    if crollo_insight:
+        insights_list.append(crollo_insight)
+
+    # --- Prodotti Sotto Costo ---
+    sotto_costo_insight = _sotto_costo_analysis(margini, nomi, trimestri)
+    if sotto_costo_insight:
+        insights_list.append(sotto_costo_insight)
+
+    return insights_list
+
+
+def _z_score_robusto(matrice: np.ndarray) -> np.ndarray:
+    """
+    Calcola lo z-score robusto (modified z-score) per colonna: 0.6745 * (x - mediana) / MAD.
+
+    Se la MAD è nulla (più di metà dei valori coincide con la mediana) si usa la deviazione media
+    assoluta: (x - mediana) / (1.2533 * MeanAD). Le colonne con tutti i valori uguali producono z-score pari a 0.
+
+    Parameters:
+        matrice (np.ndarray): Matrice (prodotti × periodi).
+
+    Returns:
+        np.ndarray: Matrice della stessa forma con lo z-score robusto di ogni valore.
+    """
+    scarti = matrice - np.median(matrice, axis=0)
+    mad = np.median(np.abs(scarti), axis=0)
+    mean_ad = np.mean(np.abs(scarti), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_mad = 0.6745 * scarti / mad
+        z_mean_ad = scarti / (1.2533 * mean_ad)
+    return np.where(mad > 0, z_mad, np.where(mean_ad > 0, z_mean_ad, 0.0))
+
+
+def _concorda_prodotti(n: int, singolare: str, plurale: str) -> str:
+    """
+    Restituisce "n prodotto ..." o "n prodotti ..." concordando il testo con il numero.
+
+    Parameters:
+        n (int): Numero di prodotti.
+        singolare (str): Testo da usare se n è 1 (es. "prodotto mostra").
+        plurale (str): Testo da usare negli altri casi (es. "prodotti mostrano").
+
+    Returns:
+        str: Il numero seguito dal testo concordato.
+    """
+    return f"{n} {singolare if n == 1 else plurale}"
+
+
+def _elenca_prodotti(nomi: np.ndarray, dettagli: Optional[np.ndarray] = None) -> str:
+    """
+    Formatta un elenco compatto dei prodotti segnalati per il testo degli insight.
+
+    Parameters:
+        nomi (np.ndarray): Nomi dei prodotti segnalati, già ordinati per gravità.
+        dettagli (np.ndarray | None): Dettaglio da mostrare tra parentesi accanto a ogni nome (es. il trimestre).
+
+    Returns:
+        str: Elenco dei primi prodotti, con l'indicazione di quanti ne restano esclusi.
+    """
+    if dettagli is None:
+        voci = [f"'{nome}'" for nome in nomi[:MAX_PRODOTTI_ELENCATI]]
+    else:
+        voci = [f"'{nome}' ({dettaglio})" for nome, dettaglio in zip(nomi[:MAX_PRODOTTI_ELENCATI], dettagli)]
+    elenco = ", ".join(voci)
+    if len(nomi) > MAX_PRODOTTI_ELENCATI:
+        elenco += f" e altri {len(nomi) - MAX_PRODOTTI_ELENCATI}"
+    return elenco
+
+
+def _crollo_vendite_analysis(vendite: np.ndarray, nomi: np.ndarray, trimestri: List[str]) -> Optional[str]:
+    """
+    Sub-routine: Analisi dei prodotti con un crollo anomalo delle vendite rispetto al trimestre precedente.
+
+    Parameters:
+        vendite (np.ndarray): Matrice (prodotti × trimestri) delle quantità vendute.
+        nomi (np.ndarray): Nomi dei prodotti, allineati alle righe della matrice.
+        trimestri (list[str]): Trimestri in cui cercare le anomalie.
+
+    Returns:
+        Optional[str]: Insight OIR se trigger attivato, altrimenti None.
+    """
+    colonne = [TRIMESTRI.index(q) - 1 for q in trimestri if q != 'Q1']
+    if not colonne:
+        return None
+
+    vendite = np.nan_to_num(vendite).clip(0, None)
+    delta_log = np.diff(np.log1p(vendite), axis=1)
+    z = _z_score_robusto(delta_log)[:, colonne]
+    calo = (1 - (vendite[:, 1:] + 1) / (vendite[:, :-1] + 1))[:, colonne]
+    # Sotto questo volume nel trimestre precedente un calo di poche unità non è significativo
+    volume_sufficiente = vendite[:, :-1][:, colonne] >= SOGLIA_VOLUME_MINIMO
+
+    anomalie = (z < SOGLIA_Z_ROBUSTO) & (calo >= SOGLIA_CALO_MINIMO) & volume_sufficiente
+    righe = np.flatnonzero(anomalie.any(axis=1))
+    if righe.size == 0:
+        return None
+
+    calo_anomalo = np.where(anomalie, calo, 0.0)[righe]
+    calo_massimo = calo_anomalo.max(axis=1)
+    # Trimestre del calo più forte per ogni prodotto (colonna j del delta = trimestre j + 1)
+    trimestre_peggiore = np.array([TRIMESTRI[c + 1] for c in colonne])[calo_anomalo.argmax(axis=1)]
+    ordine = np.argsort(-calo_massimo, kind='stable')
+
+    return (
+        "⚠️ **Insight - Crollo Anomalo delle Vendite:**\n\n"
+        f"* **Osservazione:** {_concorda_prodotti(righe.size, 'prodotto mostra', 'prodotti mostrano')} un calo delle vendite "
+        f"fuori scala rispetto al resto del menu (fino al {calo_massimo.max():.0%} rispetto al trimestre precedente): "
+        f"{_elenca_prodotti(nomi[righe[ordine]], trimestre_peggiore[ordine])}.\n"
+        "* **Implicazione:** Il calo non è spiegato dalla stagionalità generale del locale, ma riguarda specificamente questi prodotti.\n"
+        "* **Raccomandazione:** Verificare disponibilità degli ingredienti, qualità percepita e posizionamento a menu di questi prodotti nel trimestre indicato accanto a ciascuno."
+    )
+
+
+def _sotto_costo_analysis(margini: np.ndarray, nomi: np.ndarray, trimestri: List[str]) -> Optional[str]:
+    """
+    Sub-routine: Analisi dei prodotti venduti sotto il costo primo nel periodo.
+
+    Prezzo e costo primo sono unici per l'anno, quindi il segno del margine non cambia tra i trimestri:
+    il periodo determina solo se il prodotto ha venduto e l'entità della perdita.
+
+    Parameters:
+        margini (np.ndarray): Matrice (prodotti × trimestri) dei margini di periodo.
+        nomi (np.ndarray): Nomi dei prodotti, allineati alle righe della matrice.
+        trimestri (list[str]): Trimestri da considerare.
+
+    Returns:
+        Optional[str]: Insight OIR se trigger attivato, altrimenti None.
+    """
+    colonne = [TRIMESTRI.index(q) for q in trimestri]
+    perdite = np.nan_to_num(margini[:, colonne]).clip(None, 0).sum(axis=1)
+    righe = np.flatnonzero(perdite < 0)
+    if righe.size == 0:
+        return None
+
+    ordine = righe[np.argsort(perdite[righe], kind='stable')]
+
+    return (
+        "⚠️ **Insight - Prodotti Venduti Sotto Costo:**\n\n"
+        f"* **Osservazione:** {_concorda_prodotti(righe.size, 'prodotto viene venduto', 'prodotti vengono venduti')} "
+        f"sotto il costo primo, con una perdita complessiva di € {-perdite.sum():,.2f}: {_elenca_prodotti(nomi[ordine])}.\n"
+        "* **Implicazione:** Ogni unità venduta di questi prodotti riduce la profittabilità complessiva invece di contribuirvi.\n"
+        "* **Raccomandazione:** Rivedere con urgenza prezzo di vendita o ricetta di questi prodotti, oppure valutarne l'eliminazione dal menu."
+    )
@@ -4,7 +4,7 @@ import pandas as pd
 from typing import Dict, List, Tuple
 
 def arricchisci_dati_base(df_input: pd.DataFrame) -> pd.DataFrame:
-    """Prende il DataFrame grezzo e aggiunge le colonne calcolate annuali."""
+    """Prende il DataFrame già validato (vedi logic.validazione_dati) e aggiunge le colonne calcolate annuali."""
     df = df_input.copy()
     col_prezzo = "Prezzo Vendita"
     col_costo = "Costo Primo"
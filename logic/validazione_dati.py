@@ -0,0 +1,181 @@
+# logic/validazione_dati.py
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from typing import Dict, Iterator, List, Tuple
+
+# Schema atteso del file di vendite: tipo, obbligatorietà e valore minimo di ogni colonna.
+# Le colonne numeriche non obbligatorie vengono completate con 0 se vuote.
+SCHEMA_DATI: Dict[str, dict] = {
+    'Nome Piatto': {'tipo': 'testo', 'obbligatorio': True},
+    'Categoria': {'tipo': 'testo', 'obbligatorio': True},
+    'Prezzo Vendita': {'tipo': 'numero', 'obbligatorio': True, 'minimo': 0.0},
+    'Costo Primo': {'tipo': 'numero', 'obbligatorio': True, 'minimo': 0.0},
+    'Vendite_Q1': {'tipo': 'numero', 'obbligatorio': False, 'minimo': 0.0},
+    'Vendite_Q2': {'tipo': 'numero', 'obbligatorio': False, 'minimo': 0.0},
+    'Vendite_Q3': {'tipo': 'numero', 'obbligatorio': False, 'minimo': 0.0},
+    'Vendite_Q4': {'tipo': 'numero', 'obbligatorio': False, 'minimo': 0.0},
+}
+
+DIMENSIONE_BLOCCO = 50_000
+
+COLONNE_REPORT = ['Riga', 'Colonne', 'Problemi']
+
+# Tipi che pd.to_numeric convertirebbe in numeri senza errori (date in nanosecondi, booleani in 0/1)
+TIPI_NON_NUMERICI = (date, timedelta, bool, np.bool_, np.datetime64, np.timedelta64)
+
+
+class ErroreSchema(ValueError):
+    """Sollevato quando il file non contiene le colonne previste dallo schema."""
+
+
+def valida_dati(df_input: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Valida e converte il DataFrame grezzo secondo SCHEMA_DATI in un unico passaggio vettoriale.
+
+    Parameters:
+        df_input (pd.DataFrame): DataFrame grezzo letto dal file caricato. L'indice è la posizione della riga
+            di dati nel file (come restituito da pd.read_excel) e viene usato per numerare le righe del report.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Il DataFrame con i tipi già convertiti e il report delle righe
+            non valide (colonne 'Riga', 'Colonne', 'Problemi'). Il report è vuoto se il file è corretto.
+
+    Raises:
+        ErroreSchema: Se mancano una o più colonne previste dallo schema o se sono ripetute.
+    """
+    mancanti = [col for col in SCHEMA_DATI if col not in df_input.columns]
+    if mancanti:
+        raise ErroreSchema(f"Colonne mancanti nel file: {', '.join(mancanti)}")
+
+    duplicate = [col for col in SCHEMA_DATI if (df_input.columns == col).sum() > 1]
+    if duplicate:
+        raise ErroreSchema(f"Colonne duplicate: {', '.join(duplicate)}")
+
+    df = df_input.copy()
+    problemi: Dict[str, pd.Series] = {}
+
+    for col, regola in SCHEMA_DATI.items():
+        grezzo = df[col]
+        if regola['tipo'] == 'numero':
+            tipo_errato = grezzo.map(lambda v: isinstance(v, TIPI_NON_NUMERICI)).astype(bool)
+            valori = pd.to_numeric(grezzo.astype(object).mask(tipo_errato), errors='coerce')
+            vuoti = ~tipo_errato & (grezzo.isna() | grezzo.astype(str).str.strip().eq(''))
+            non_numerici = (valori.isna() & ~vuoti) | ~np.isfinite(valori.fillna(0.0))
+            valori = valori.where(~non_numerici)
+            sotto_minimo = valori < regola['minimo']
+            if not regola['obbligatorio']:
+                valori = valori.fillna(0.0)
+            df[col] = valori.astype(float)
+        else:
+            valori = grezzo.astype('string').str.strip()
+            vuoti = valori.isna() | valori.eq('')
+            non_numerici = pd.Series(False, index=df.index)
+            sotto_minimo = pd.Series(False, index=df.index)
+            df[col] = valori.astype(object)
+
+        messaggio = pd.Series('', index=df.index)
+        if regola['obbligatorio']:
+            messaggio = messaggio.mask(vuoti, 'valore mancante')
+        messaggio = messaggio.mask(non_numerici, 'non numerico')
+        messaggio = messaggio.mask(sotto_minimo.fillna(False), 'negativo')
+        problemi[col] = messaggio
+
+    return df, _costruisci_report(pd.DataFrame(problemi))
+
+
+def _costruisci_report(problemi: pd.DataFrame) -> pd.DataFrame:
+    """
+    Riassume la matrice (righe × colonne) dei problemi in una riga di report per ogni riga non valida.
+
+    Parameters:
+        problemi (pd.DataFrame): Messaggio di errore per cella, stringa vuota se la cella è valida.
+
+    Returns:
+        pd.DataFrame: Report compatto con colonne 'Riga', 'Colonne', 'Problemi'.
+    """
+    celle = problemi.stack()
+    celle = celle[celle != '']
+    if celle.empty:
+        return pd.DataFrame(columns=COLONNE_REPORT)
+
+    celle = celle.reset_index()
+    celle.columns = ['Riga', 'Colonna', 'Problema']
+    # La riga 1 del file Excel è l'intestazione
+    celle['Riga'] += 2
+    celle['Problema'] = celle['Colonna'] + ': ' + celle['Problema']
+
+    return celle.groupby('Riga', sort=True).agg(
+        Colonne=('Colonna', ', '.join),
+        Problemi=('Problema', '; '.join)
+    ).reset_index()
+
+
+def leggi_e_valida_excel(file, dimensione_blocco: int = DIMENSIONE_BLOCCO) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Legge un file Excel a blocchi e valida ciascun blocco man mano che viene letto.
+
+    Parameters:
+        file: Percorso o oggetto file-like del file .xlsx caricato.
+        dimensione_blocco (int): Numero massimo di righe per blocco.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Il DataFrame completo già convertito e il report delle righe non valide.
+
+    Raises:
+        ErroreSchema: Se il file è vuoto o se colonne previste dallo schema mancano o sono ripetute.
+    """
+    blocchi: List[pd.DataFrame] = []
+    report: List[pd.DataFrame] = []
+    for blocco in _leggi_blocchi_excel(file, dimensione_blocco):
+        df_blocco, report_blocco = valida_dati(blocco)
+        blocchi.append(df_blocco)
+        if not report_blocco.empty:
+            report.append(report_blocco)
+
+    if not blocchi:
+        raise ErroreSchema("Il file non contiene dati.")
+
+    df = pd.concat(blocchi, ignore_index=True)
+    df_report = pd.concat(report, ignore_index=True) if report else pd.DataFrame(columns=COLONNE_REPORT)
+    return df, df_report
+
+
+def _leggi_blocchi_excel(file, dimensione_blocco: int) -> Iterator[pd.DataFrame]:
+    """
+    Itera sul primo foglio del file Excel in modalità streaming, restituendo blocchi di righe.
+
+    Parameters:
+        file: Percorso o oggetto file-like del file .xlsx.
+        dimensione_blocco (int): Numero massimo di righe per blocco.
+
+    Returns:
+        Iterator[pd.DataFrame]: Blocchi consecutivi con l'intestazione del file come colonne. Le righe vuote
+            vengono saltate e l'indice conserva la posizione originale della riga nel file.
+    """
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        righe = wb.worksheets[0].iter_rows(values_only=True)
+        intestazione = next(righe, None)
+        if intestazione is None:
+            return
+        colonne = [str(c).strip() if c is not None else '' for c in intestazione]
+
+        n_colonne = len(colonne)
+        buffer: List[tuple] = []
+        posizioni: List[int] = []
+        for posizione, riga in enumerate(righe):
+            if all(cella is None for cella in riga):
+                continue
+            buffer.append(tuple(riga[:n_colonne]) + (None,) * (n_colonne - len(riga)))
+            posizioni.append(posizione)
+            if len(buffer) >= dimensione_blocco:
+                yield pd.DataFrame(buffer, columns=colonne, index=posizioni)
+                buffer, posizioni = [], []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=colonne, index=posizioni)
+    finally:
+        wb.close()
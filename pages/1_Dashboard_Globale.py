@@ -17,7 +17,8 @@ from logic.logic_core import (
 )
 from logic.insights_logic import (
     analizza_kpi_trends,
-    analizza_struttura_business
+    analizza_struttura_business,
+    analizza_anomalie_prodotti
 )
 # --- IMPOSTAZIONI SPECIFICHE DELLA PAGINA ---
 st.set_page_config(
@@ -69,6 +70,9 @@ insight_trend_list = analizza_kpi_trends(kpi_correnti_dict, kpi_precedenti_dict)
 
 # Insight strutturali basati sull'intero anno (usiamo df_annuale che abbiamo già)
 insight_strutturali_list = analizza_struttura_business(df_annuale)
+
+# Insight sulle anomalie dei singoli prodotti nel periodo selezionato
+insight_anomalie_list = analizza_anomalie_prodotti(df_annuale, periodo_selezionato)
 st.header("KPI Globali")
 kpi_cols = st.columns(5)
 
@@ -135,6 +139,11 @@ with st.expander("Mostra/Nascondi Commenti Strategici", expanded=True):
         st.markdown(insight_trend_list[0])
         st.divider()
 
+    # Mostra le anomalie a livello di singolo prodotto
+    for insight in insight_anomalie_list:
+        st.markdown(insight)
+        st.divider()
+
     # Mostra gli insight strutturali, solo se si sta guardando l'Anno Intero
     if periodo_selezionato == 'Anno Intero':
         if not insight_strutturali_list:
@@ -147,7 +156,7 @@ with st.expander("Mostra/Nascondi Commenti Strategici", expanded=True):
                     st.divider()
     
     # Messaggio di default se non è stato trovato assolutamente nessun insight
-    if not insight_trend_list and periodo_selezionato != 'Anno Intero':
+    if not insight_trend_list and not insight_anomalie_list and periodo_selezionato != 'Anno Intero':
         st.success("Analisi completata. Nessuna tendenza significativa rilevata per questo trimestre.")
 
 # --- VISUALIZZAZIONI GRAFICHE ---
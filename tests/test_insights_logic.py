@@ -0,0 +1,77 @@
+# tests/test_insights_logic.py
+
+import numpy as np
+import pandas as pd
+
+from logic.insights_logic import analizza_anomalie_prodotti, _z_score_robusto
+
+
+def _catalogo(n: int = 20, vendite: int = 100) -> pd.DataFrame:
+    """Catalogo piatto: n prodotti con prezzo, costo e vendite identici in ogni trimestre."""
+    return pd.DataFrame({
+        'Nome Piatto': [f'Piatto {i}' for i in range(n)],
+        'Categoria': 'Primi',
+        'Prezzo Vendita': 10.0,
+        'Costo Primo': 4.0,
+        'Vendite_Q1': vendite,
+        'Vendite_Q2': vendite,
+        'Vendite_Q3': vendite,
+        'Vendite_Q4': vendite,
+    })
+
+
+def test_z_score_robusto_mad_nulla_usa_deviazione_media():
+    colonna = np.array([[0.0]] * 20 + [[-4.0]])
+    z = _z_score_robusto(colonna)
+    assert z[-1, 0] < -3.5
+    assert np.all(z[:-1, 0] == 0)
+
+
+def test_crollo_su_catalogo_piatto():
+    df = _catalogo()
+    df.loc[20] = ['Tiramisù', 'Dolci', 6.0, 2.0, 100, 100, 0, 100]
+
+    for periodo in ('Q3', 'Anno Intero'):
+        insights = analizza_anomalie_prodotti(df, periodo)
+        assert len(insights) == 1
+        assert 'Crollo Anomalo' in insights[0]
+        assert "1 prodotto mostra" in insights[0]
+        assert "'Tiramisù' (Q3)" in insights[0]
+
+    # La ripresa in Q4 non è un crollo
+    assert analizza_anomalie_prodotti(df, 'Q4') == []
+
+
+def test_crollo_a_basso_volume_non_segnalato():
+    df = _catalogo()
+    df.loc[20] = ['Rare', 'Dolci', 6.0, 2.0, 1, 1, 0, 1]
+
+    assert analizza_anomalie_prodotti(df, 'Q3') == []
+    assert analizza_anomalie_prodotti(df, 'Anno Intero') == []
+
+
+def test_q1_non_ha_trimestre_precedente():
+    df = _catalogo()
+    df.loc[20] = ['Tiramisù', 'Dolci', 6.0, 2.0, 0, 100, 100, 100]
+    assert analizza_anomalie_prodotti(df, 'Q1') == []
+
+
+def test_sotto_costo_per_trimestre_e_anno():
+    df = _catalogo()
+    df.loc[20] = ['Aragosta', 'Secondi', 20.0, 25.0, 0, 10, 0, 0]
+
+    q2 = analizza_anomalie_prodotti(df, 'Q2')
+    assert len(q2) == 1
+    assert 'Sotto Costo' in q2[0]
+    assert "1 prodotto viene venduto" in q2[0]
+    assert '€ 50.00' in q2[0]
+
+    # In Q3 il prodotto non vende: nessuna perdita (il calo da Q2 è invece segnalato come crollo)
+    assert not any('Sotto Costo' in insight for insight in analizza_anomalie_prodotti(df, 'Q3'))
+
+    anno = analizza_anomalie_prodotti(df, 'Anno Intero')
+    assert any('Sotto Costo' in insight and "'Aragosta'" in insight for insight in anno)
+
+
+def test_catalogo_vuoto():
+    assert analizza_anomalie_prodotti(_catalogo().iloc[0:0], 'Anno Intero') == []
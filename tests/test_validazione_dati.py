@@ -0,0 +1,109 @@
+# tests/test_validazione_dati.py
+
+from datetime import datetime
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from logic.validazione_dati import SCHEMA_DATI, ErroreSchema, leggi_e_valida_excel, valida_dati
+
+INTESTAZIONE = list(SCHEMA_DATI)
+
+
+def _riga(nome: str = 'Carbonara', **valori) -> dict:
+    """Riga valida secondo lo schema, con eventuali valori sostituiti."""
+    riga = {
+        'Nome Piatto': nome,
+        'Categoria': 'Primi',
+        'Prezzo Vendita': 12.0,
+        'Costo Primo': 4.0,
+        'Vendite_Q1': 10,
+        'Vendite_Q2': 20,
+        'Vendite_Q3': 30,
+        'Vendite_Q4': 40,
+    }
+    riga.update(valori)
+    return riga
+
+
+def _excel(righe: list) -> BytesIO:
+    """File .xlsx in memoria con l'intestazione dello schema e le righe date (None = riga vuota)."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(INTESTAZIONE)
+    for riga in righe:
+        ws.append([None] * len(INTESTAZIONE) if riga is None else [riga[col] for col in INTESTAZIONE])
+    file = BytesIO()
+    wb.save(file)
+    file.seek(0)
+    return file
+
+
+def test_report_numera_righe_excel_e_unisce_colonne():
+    df = pd.DataFrame([
+        _riga(),
+        _riga(Categoria=' ', **{'Prezzo Vendita': 'abc'}),
+        _riga(Vendite_Q1=-3),
+    ])
+    _, report = valida_dati(df)
+
+    assert report['Riga'].tolist() == [3, 4]
+    assert report.loc[0, 'Colonne'] == 'Categoria, Prezzo Vendita'
+    assert report.loc[0, 'Problemi'] == 'Categoria: valore mancante; Prezzo Vendita: non numerico'
+    assert report.loc[1, 'Problemi'] == 'Vendite_Q1: negativo'
+
+
+@pytest.mark.parametrize('valore', [datetime(2024, 1, 1), True, float('inf')])
+def test_valori_non_numerici_convertibili_sono_segnalati(valore):
+    df = pd.DataFrame([_riga(**{'Prezzo Vendita': valore})])
+    _, report = valida_dati(df)
+
+    assert report.loc[0, 'Problemi'] == 'Prezzo Vendita: non numerico'
+
+
+def test_colonne_mancanti():
+    df = pd.DataFrame([_riga()]).drop(columns=['Categoria'])
+    with pytest.raises(ErroreSchema, match='Categoria'):
+        valida_dati(df)
+
+
+def test_colonne_duplicate():
+    df = pd.DataFrame([_riga()])
+    df = pd.concat([df, df[['Prezzo Vendita']]], axis=1)
+    with pytest.raises(ErroreSchema, match='Colonne duplicate: Prezzo Vendita'):
+        valida_dati(df)
+
+
+def test_file_con_sola_intestazione():
+    with pytest.raises(ErroreSchema):
+        leggi_e_valida_excel(_excel([]))
+
+
+def test_quantita_vuote_completate_con_zero():
+    df, report = valida_dati(pd.DataFrame([_riga(Vendite_Q2=None)]))
+
+    assert report.empty
+    assert df.loc[0, 'Vendite_Q2'] == 0.0
+    for col, regola in SCHEMA_DATI.items():
+        if regola['tipo'] == 'numero':
+            assert df[col].dtype == float
+
+
+def test_lettura_a_blocchi_con_righe_vuote():
+    righe = [
+        _riga('A'),
+        None,
+        _riga('B', Vendite_Q3=-1),
+        _riga('C'),
+        None,
+        _riga('D', Categoria=None),
+        _riga('E'),
+    ]
+    df, report = leggi_e_valida_excel(_excel(righe), dimensione_blocco=2)
+
+    assert df['Nome Piatto'].tolist() == ['A', 'B', 'C', 'D', 'E']
+    assert df.index.tolist() == [0, 1, 2, 3, 4]
+    assert report['Riga'].tolist() == [4, 7]
+    assert report['Colonne'].tolist() == ['Vendite_Q3', 'Categoria']